@@ -70,6 +70,4 @@ def generate_topology(communities, connections, n_err, Psl, simulation=True):
       else:
         data['landmark'] = 0
 
-    trust_topology.add_node(node, data)
-
   return trust_topology
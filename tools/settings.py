@@ -9,6 +9,8 @@ DATA_DIRECTORY = os.path.join(TESTBED_ROOT, "data")
 OUTPUT_DIRECTORY = os.path.join(TESTBED_ROOT, "output")
 OUTPUT_GRAPH_FORMAT = "pdf"
 GRAPH_TRANSPARENCY = False
+# Resolution of rasterized artists (such as dense CDF traces) in vector output
+GRAPH_RASTER_DPI = 150
 
 # Cluster configuration. Each key defines a Python module which will be responsible
 # for setting up the cluster.
@@ -17,7 +17,6 @@
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 #
 
-from .topologies import generator
 from . import exceptions
 
 import collections
@@ -166,6 +165,7 @@ class GraphDescriptor(object):
     :param settings: User settings
     """
 
+    plotter = None
     try:
       # Create a new plotter instance
       plotter = self.plotter(self, run_id, runs, settings)
@@ -175,6 +175,9 @@ class GraphDescriptor(object):
     except:
       logger.error("An error has ocurred while plotting the graph!")
       raise
+    finally:
+      if plotter is not None:
+        plotter.close()
 
 
 class Catalog(object):
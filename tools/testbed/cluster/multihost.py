@@ -197,6 +197,9 @@ class MultihostCluster(base.ClusterRunnerBase):
 
   slaves = []
 
+  log_master = None
+  log_controller = None
+
   def setup(self, run, run_id):
     """
     Prepares the cluster for running the emulation.
@@ -226,13 +229,13 @@ class MultihostCluster(base.ClusterRunnerBase):
       self.local_output_directory = out_dir
 
       # Store run identifier
-      with open(os.path.join(self.settings.OUTPUT_DIRECTORY, run_id, run.name, "version"), 'w') as f:
+      with open(os.path.join(out_dir, "version"), 'w') as f:
         f.write("%s\n" % run_id)
 
       # Open files for logging execution
       logger.info("Opening log files to monitor scenario execution...")
-      self.log_master = open(os.path.join(self.settings.OUTPUT_DIRECTORY, run_id, run.name, "tb_master.log"), 'w')
-      self.log_controller = open(os.path.join(self.settings.OUTPUT_DIRECTORY, run_id, run.name, "tb_controller.log"), 'w')
+      self.log_master = open(os.path.join(out_dir, "tb_master.log"), 'w')
+      self.log_controller = open(os.path.join(out_dir, "tb_controller.log"), 'w')
 
       # Start cluster master process
       logger.info("Starting master node...")
@@ -291,7 +294,7 @@ class MultihostCluster(base.ClusterRunnerBase):
       time.sleep(5)
 
       logger.info("Cluster ready.")
-    except:
+    except Exception:
       logger.error("Error while setting up cluster, aborting!")
       raise
 
@@ -305,7 +308,7 @@ class MultihostCluster(base.ClusterRunnerBase):
       raise exceptions.ScenarioRunFailed
 
     # Generate required topology
-    topology_path = os.path.join(self.settings.OUTPUT_DIRECTORY, run_id, run.name, 'input-topology.graphml')
+    topology_path = os.path.join(self.local_output_directory, 'input-topology.graphml')
     run.generate_topology(topology_path)
 
     # Prepare remote output directory
@@ -355,18 +358,31 @@ class MultihostCluster(base.ClusterRunnerBase):
 
     logger.info("Shutting down cluster...")
 
-    for host in self.host_workers:
-      host.close()
-
-    if self.host_mc:
+    # Failures to reach a host are only logged, so that they do not mask the
+    # error that caused the shutdown
+    for host in (self.host_workers or []):
+      try:
+        host.close()
+      except:
+        import traceback
+        logger.error("Failed to close host '%s':" % host.host_id)
+        logger.error(traceback.format_exc())
+
+    if self.host_mc is not None:
       logger.info("Copying data from MC node...")
       self.host_mc.copy_output_data()
-      self.host_mc.close()
-
-    self.log_master.close()
-    self.log_controller.close()
-
-    for slave in self.slaves:
+      try:
+        self.host_mc.close()
+      except:
+        import traceback
+        logger.error("Failed to close host '%s':" % self.host_mc.host_id)
+        logger.error(traceback.format_exc())
+
+    for log in (self.log_master, self.log_controller):
+      if log is not None:
+        log.close()
+
+    for slave in (self.slaves or []):
       if slave['log']:
         slave['log'].close()
 
@@ -375,3 +391,5 @@ class MultihostCluster(base.ClusterRunnerBase):
     self.host_mc = None
     self.host_workers = []
     self.slaves = []
+    self.log_master = None
+    self.log_controller = None
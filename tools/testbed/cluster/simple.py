@@ -31,13 +31,16 @@ import time
 
 logger = logging.getLogger('testbed.cluster.simple')
 
+# Message logged by a slave after it has registered with the master
+SLAVE_REGISTERED_MARKER = "Successfully registered on the master node."
+
 
 class SimpleCluster(base.ClusterRunnerBase):
   """
   Sets up a simple cluster running on a single machine.
   """
 
-  master_id = None
+  output_directory = None
 
   master = None
   slaves = None
@@ -47,16 +50,60 @@ class SimpleCluster(base.ClusterRunnerBase):
   log_controller = None
 
   def _setup_limits(self):
-    # Enable the production of core dumps
+    # Enable the production of core dumps; the limits are set on the runner process
+    # and inherited by all spawned testbed processes
     resource.setrlimit(resource.RLIMIT_CORE, (resource.RLIM_INFINITY, resource.RLIM_INFINITY))
 
+  def _wait_for_slaves(self, timeout=30.0):
+    """
+    Waits until all slaves report successful registration in their logs
+    or the timeout expires.
+
+    :param timeout: Maximum number of seconds to wait
+    """
+
+    # Only bytes appended since the previous check are scanned; the end of the
+    # previously read data is kept so that a marker split between two reads is
+    # still found
+    overlap = len(SLAVE_REGISTERED_MARKER) - 1
+    pending = [dict(slave=slave, offset=0, tail='') for slave in self.slaves]
+    deadline = time.time() + timeout
+    while True:
+      for state in pending[:]:
+        slave = state['slave']
+        if slave['slave'].poll() is not None:
+          logger.error("Slave process terminated before registering with the master!")
+          raise exceptions.ScenarioRunFailed
+
+        with open(slave['log'].name, 'rb') as log:
+          log.seek(state['offset'])
+          data = log.read()
+
+        state['offset'] += len(data)
+        data = state['tail'] + data
+        if SLAVE_REGISTERED_MARKER in data:
+          pending.remove(state)
+        else:
+          state['tail'] = data[-overlap:]
+
+      if not pending:
+        break
+      elif time.time() > deadline:
+        logger.warning("Timed out while waiting for %d slave(s) to register." % len(pending))
+        break
+
+      time.sleep(0.1)
+
   def setup(self, run, run_id):
     """
     Prepares the cluster for running the emulation.
     """
 
     try:
-      # Generate identifier for the cluster master
+      # Ensure that resource limits are configured correctly before starting
+      self._setup_limits()
+
+      # Static key pair for the cluster master
       self.master_private_key = 'W3qqkUybqur79JJbxIiWYcayXgt+tiWF6D+5T7/HS8YfbBlLHGqK2KtEwqtBEO/a4Lx7XPcXZKUQthvByC2x09NRG1icM43SnlDnFOy3eV0jUTPnJwBACh2tENJOrI6r'
       self.master_public_key = 'H2wZSxxqitirRMKrQRDv2uC8e1z3F2SlELYbwcgtsdOj57Ei5oZ3fDnD+HY9TQQPOQckN6P1fF38VlnAlbfBPA=='
 
@@ -67,15 +114,16 @@ class SimpleCluster(base.ClusterRunnerBase):
         shutil.rmtree(out_dir)
 
       os.makedirs(out_dir)
+      self.output_directory = out_dir
 
       # Store run identifier
-      with open(os.path.join(self.settings.OUTPUT_DIRECTORY, run_id, run.name, "version"), 'w') as f:
+      with open(os.path.join(out_dir, "version"), 'w') as f:
         f.write("%s\n" % run_id)
 
       # Open files for logging execution
       logger.info("Opening log files to monitor scenario execution...")
-      self.log_master = open(os.path.join(self.settings.OUTPUT_DIRECTORY, run_id, run.name, "tb_master.log"), 'w')
-      self.log_controller = open(os.path.join(self.settings.OUTPUT_DIRECTORY, run_id, run.name, "tb_controller.log"), 'w')
+      self.log_master = open(os.path.join(out_dir, "tb_master.log"), 'wb', 1 << 20)
+      self.log_controller = open(os.path.join(out_dir, "tb_controller.log"), 'wb', 1 << 20)
 
       # Start cluster master process
       logger.info("Starting master node...")
@@ -89,12 +137,10 @@ class SimpleCluster(base.ClusterRunnerBase):
           "--cluster-pub-key", self.master_public_key
         ],
         stdin=None,
-        stderr=self.log_master,
         stdout=self.log_master,
+        stderr=subprocess.STDOUT,
         # Ensure proper working directory
-        cwd=self.settings.TESTBED_ROOT,
-        # Ensure that resource limits are configured correctly before starting
-        preexec_fn=self._setup_limits
+        cwd=self.settings.TESTBED_ROOT
       )
 
       # Compute how we will distribute the slaves around; if there are more than 2 cores
@@ -109,7 +155,7 @@ class SimpleCluster(base.ClusterRunnerBase):
       self.slaves = []
       for slave_id in xrange(1, required_slaves + 1):
         logger.info("  * Starting slave %d." % slave_id)
-        log_slave = open(os.path.join(self.settings.OUTPUT_DIRECTORY, run_id, run.name, "tb_slave%d.log" % slave_id), 'w')
+        log_slave = open(os.path.join(out_dir, "tb_slave%d.log" % slave_id), 'wb', 1 << 20)
         slave = subprocess.Popen(
           [
             self.settings.TESTBED_BINARY,
@@ -124,20 +170,18 @@ class SimpleCluster(base.ClusterRunnerBase):
             "--exit-on-finish"
           ],
           stdin=None,
-          stderr=log_slave,
           stdout=log_slave,
+          stderr=subprocess.STDOUT,
           # Ensure proper working directory
-          cwd=self.settings.TESTBED_ROOT,
-          # Ensure that resource limits are configured correctly before starting
-          preexec_fn=self._setup_limits
+          cwd=self.settings.TESTBED_ROOT
         )
         self.slaves.append(dict(slave=slave, log=log_slave))
 
       # Wait for the slaves to register themselves
-      time.sleep(5)
+      self._wait_for_slaves()
 
       logger.info("Simple cluster ready.")
-    except:
+    except Exception:
       logger.error("Error while setting up cluster, aborting!")
       raise
 
@@ -151,7 +195,7 @@ class SimpleCluster(base.ClusterRunnerBase):
       raise exceptions.ScenarioRunFailed
 
     # Generate required topology
-    topology_path = os.path.join(self.settings.OUTPUT_DIRECTORY, run_id, run.name, 'input-topology.graphml')
+    topology_path = os.path.join(self.output_directory, 'input-topology.graphml')
     run.generate_topology(topology_path)
 
     # Run the scenario via the controller
@@ -164,17 +208,15 @@ class SimpleCluster(base.ClusterRunnerBase):
         "--cluster-master-pub-key", self.master_public_key,
         "--topology", topology_path,
         "--scenario", run.settings['scenario'],
-        "--out-dir", os.path.join(self.settings.OUTPUT_DIRECTORY, run_id, run.name),
+        "--out-dir", self.output_directory,
         "--id-gen", run.settings.get('id_gen', 'consistent'),
         "--seed", str(run.settings.get('seed', 1))
       ],
       stdin=None,
-      stderr=self.log_controller,
       stdout=self.log_controller,
+      stderr=subprocess.STDOUT,
       # Ensure proper working directory
-      cwd=self.settings.TESTBED_ROOT,
-      # Ensure that resource limits are configured correctly before starting
-      preexec_fn=self._setup_limits
+      cwd=self.settings.TESTBED_ROOT
     )
 
     # Wait for the scenario to complete
@@ -190,31 +232,33 @@ class SimpleCluster(base.ClusterRunnerBase):
 
     logger.info("Shutting down cluster...")
 
-    # Terminate everything
-    for process in (self.controller, self.master):
-      if process is None:
-        continue
-
+    # Terminate everything; all processes are signalled first so that they exit
+    # concurrently and are only then reaped one by one
+    processes = [self.controller, self.master] + [slave['slave'] for slave in (self.slaves or [])]
+    processes = [process for process in processes if process is not None]
+    for process in processes:
       try:
         process.kill()
-        process.wait()
       except OSError:
         pass
 
-    for slave in (self.slaves or []):
+    for process in processes:
       try:
-        slave['slave'].kill()
-        slave['slave'].wait()
+        process.wait()
       except OSError:
         pass
 
+    for slave in (self.slaves or []):
       slave['log'].close()
 
+    for log in (self.log_master, self.log_controller):
+      if log is not None:
+        log.close()
+
     # Reset
     self.controller = None
     self.slaves = None
     self.master = None
-    self.master_id = None
-
-    self.log_master.close()
-    self.log_controller.close()
+    self.log_master = None
+    self.log_controller = None
+    self.output_directory = None
@@ -17,6 +17,11 @@
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 #
 
+# Plots are only ever rendered to files, so select the non-interactive backend
+# before any plotter gets imported
+import matplotlib
+matplotlib.use('Agg')
+
 from .link_congestion import *
 from .messaging_performance import *
 from .overall_path_stretch_distribution import *
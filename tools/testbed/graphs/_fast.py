@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of UNISPHERE.
+#
+# Copyright (C) 2013 Jernej Kos <jernej@kos.mx>
+#
+# This library is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+# Numeric kernels shared by plotters; they are compiled with Numba when it is
+# available and fall back to plain NumPy otherwise
+
+import math
+import numpy
+
+try:
+  import numba
+except ImportError:
+  numba = None
+
+if numba is not None:
+  @numba.njit(cache=True)
+  def _fill_missing(a):
+    rows, columns = a.shape
+    first = numpy.full(columns, -1)
+    for t in range(rows):
+      for n in range(columns):
+        if math.isnan(a[t, n]):
+          if t > 0:
+            a[t, n] = a[t - 1, n]
+        elif first[n] < 0:
+          first[n] = t
+
+    for n in range(columns):
+      for t in range(first[n]):
+        a[t, n] = a[first[n], n]
+
+    return a
+
+  @numba.njit(cache=True)
+  def _ecdf(a):
+    x = numpy.sort(a)
+    n = x.size
+    y = numpy.arange(1, n + 1).astype(numpy.float64) / n
+    return x, y
+
+
+def ecdf(values):
+  """
+  Returns the step arrays (sorted values and cumulative probabilities) of
+  the empirical distribution function of the given values.
+
+  :param values: A one-dimensional array of numbers
+  """
+
+  values = numpy.ascontiguousarray(values, dtype=numpy.float64)
+  if numba is not None:
+    return _ecdf(values)
+
+  x = numpy.sort(values)
+  y = numpy.arange(1, x.size + 1, dtype=numpy.float64) / x.size
+  return x, y
+
+
+def fill_missing(values):
+  """
+  Fills missing (NaN) values in each column of a two-dimensional array with
+  the last preceding value in the same column. Values missing before the
+  first one in a column are filled with that first value.
+
+  :param values: A two-dimensional array of floats
+  """
+
+  values = numpy.array(values, dtype=numpy.float64)
+  if numba is not None:
+    return _fill_missing(values)
+
+  missing = numpy.isnan(values)
+  columns = numpy.arange(values.shape[1])
+  rows = numpy.where(missing, 0, numpy.arange(values.shape[0])[:, None])
+  numpy.maximum.accumulate(rows, axis=0, out=rows)
+  values = values[rows, columns]
+
+  first = numpy.argmax(~missing, axis=0)
+  return numpy.where(numpy.isnan(values), values[first, columns], values)
@@ -20,8 +20,7 @@
 
 from . import base
 
-import matplotlib.pyplot as plt
-import numpy
+import pandas
 
 
 class AvailabilityVsAttackEdges(base.PlotterBase):
@@ -34,42 +33,46 @@ class AvailabilityVsAttackEdges(base.PlotterBase):
     Plots the deliverability and resolvability  vs. fraction of attack edges.
     """
 
-    fig, ax = plt.subplots()
+    fig = self._fig
+    ax = self._new_axes()
 
-    values = {
-      'resolved pairs': {},
-      'deliverability': {},
-    }
-    for run in self.runs:
-      # Load datasets
-      data_deliverability = run.get_dataset("routing-pair_wise_ping-raw-*.csv")
-      data_resolvability = run.get_dataset("sanity-check_consistent_ndb-report-*.csv")
-      # Load input graph
-      graph = run.get_graph("input-topology.graphml")
+    def load(run):
+      # Load datasets (only the columns that are actually used)
+      data_deliverability = run.get_dataset("routing-pair_wise_ping-raw-*.csv",
+        usecols=['success'], dtype={'success': 'bool'})
+      data_resolvability = run.get_dataset("sanity-check_consistent_ndb-report-*.csv",
+        usecols=['ratio'], dtype={'ratio': 'float32'})
+      # Determine the size of the input graph
+      edges = run.get_edge_count("input-topology.graphml")
 
       # Extract deliverability information
-      pairs = len(data_deliverability)
-      delivered = data_deliverability['success'].sum()
+      pairs = data_deliverability.shape[0]
+      delivered = int(data_deliverability['success'].values.sum())
       # Extract resolvability information
       resolved = float(data_resolvability['ratio'].sum())
 
-      # Compute fraction of attack edges in the graph
+      # Compute fraction of attack edges in the graph, binned as an integer
+      # percentage so that equal fractions always end up in the same group
       attack_edges = run.orig.settings['attack_edges']
-      edge_fraction = round(attack_edges / float(graph.number_of_edges()), 2)
+      edge_percent = int(round(100.0 * attack_edges / edges))
+
+      return (edge_percent, delivered / float(pairs), resolved)
 
-      values['deliverability'].setdefault(edge_fraction, []).append(delivered / float(pairs))
-      values['resolved pairs'].setdefault(edge_fraction, []).append(resolved)
+    rows = self.map_runs(load)
+
+    # Aggregate all runs with the same fraction of attack edges
+    values = pandas.DataFrame(rows, columns=['edge_percent', 'deliverability', 'resolved pairs'])
+    values = values.groupby('edge_percent')
+    averages = values.mean()
+    deviations = values.std(ddof=0)
 
     dash = {
       'deliverability': (5, 5),
       'resolved pairs': (None, None),
     }
-    for k, v in values.iteritems():
-      X = sorted(v.keys())
-      Y = [numpy.average(v[x]) for x in X]
-      Yerr = [numpy.std(v[x]) for x in X]
-
-      ax.errorbar(X, Y, Yerr, label=k.capitalize(), color='black', dashes=dash[k], marker='x')
+    for k in ('resolved pairs', 'deliverability'):
+      ax.errorbar(averages.index.values / 100.0, averages[k].values, deviations[k].values,
+        label=k.capitalize(), color='black', dashes=dash[k], marker='x')
 
     ax.set_xlabel(u'Delež napadenih povezav')
     ax.grid()
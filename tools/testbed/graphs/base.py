@@ -19,114 +19,287 @@
 
 from .. import exceptions
 
-import collections
-import glob
-import heapq
-import itertools
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+import fnmatch
 import logging
 import matplotlib
-import networkx as nx
+import multiprocessing.pool
 import numpy
 import os
 import pandas
-import tempfile
+
+try:
+  import xml.etree.cElementTree as ElementTree
+except ImportError:
+  import xml.etree.ElementTree as ElementTree
 
 logger = logging.getLogger('testbed.graphs.base')
 
+GRAPHML_NS = '{http://graphml.graphdrawing.org/xmlns}'
+
+# Maximum number of threads used to load datasets of different runs
+MAX_LOAD_THREADS = 8
+
+# Black and white line styles for each color of the default color cycle
+BW_COLOR_CYCLE = ('b', 'g', 'r', 'c', 'm', 'y', 'k')
+BW_COLORMAP = {
+  'b': {'marker': None, 'dash': (None,None)},
+  'g': {'marker': None, 'dash': [5,5]},
+  'r': {'marker': None, 'dash': [5,3,1,3]},
+  'c': {'marker': None, 'dash': [1,3]},
+  'm': {'marker': None, 'dash': [5,2,5,2,5,10]},
+  'y': {'marker': None, 'dash': [5,3,1,2,1,10]},
+  'k': {'marker': 'o', 'dash': (None,None)} #[1,2,1,10]}
+}
+
+
+def freeze(value):
+  """
+  Converts a (possibly nested) value into a hashable form so that it may
+  be used as part of a cache key.
+  """
+
+  if isinstance(value, dict):
+    return tuple(sorted((key, freeze(item)) for key, item in value.items()))
+  elif isinstance(value, (set, frozenset)):
+    return frozenset(freeze(item) for item in value)
+  elif isinstance(value, (list, tuple)):
+    return tuple(freeze(item) for item in value)
+
+  return value
+
+
+def compact_ecdf(x, y, xmin=None):
+  """
+  Reduces ECDF step arrays to the points that are actually visible. Runs
+  of equal x values are collapsed into their last (highest) step and points
+  left of xmin are dropped, except for the one that the first visible step
+  starts from.
+  """
+
+  keep = numpy.append(numpy.diff(x) != 0, True)
+  x = x[keep]
+  y = y[keep]
+
+  if xmin is not None:
+    start = max(numpy.searchsorted(x, xmin, side='right') - 1, 0)
+    x = x[start:]
+    y = y[start:]
+
+  return x, y
+
+
+def resample_ecdf(x, points=1000):
+  """
+  Evaluates the ECDF of sorted values on an evenly spaced grid of points
+  spanning their range, so that plots of large samples stay light.
+
+  :param x: Sorted sample values
+  :param points: Number of grid points
+  """
+
+  if x.size <= points:
+    return x, numpy.arange(1, x.size + 1, dtype=numpy.float64) / x.size
+
+  grid = numpy.linspace(x[0], x[-1], points)
+  return grid, numpy.searchsorted(x, grid, side='right') / float(x.size)
+
 
 class RunOutputDescriptor(object):
+  # Descriptors are shared by all plotters of a run group, so each dataset is
+  # only parsed once per run group
+  _instances = {}
+
+  @classmethod
+  def get(cls, run_id, run, settings):
+    """
+    Returns the shared output descriptor for the given run.
+    """
+
+    descriptors = cls._instances.setdefault(run_id, {})
+    try:
+      return descriptors[run.name]
+    except KeyError:
+      descriptor = cls(run_id, run, settings)
+      descriptors[run.name] = descriptor
+      return descriptor
+
+  @classmethod
+  def release(cls, run_id):
+    """
+    Releases shared output descriptors of the given run group together
+    with all their cached datasets.
+    """
+
+    cls._instances.pop(run_id, None)
+
   def __init__(self, run_id, run, settings):
     self.run_id = run_id
     self.orig = run
     self.settings = settings
 
+    # Caches of already resolved and parsed datasets
+    self._file_cache = {}
+    self._df_cache = {}
+    self._degree_cache = {}
+    self._edge_count_cache = {}
+    self._column_cache = {}
+
   def get_file(self, ds_expression):
+    try:
+      return self._file_cache[ds_expression]
+    except KeyError:
+      pass
+
     ds_path = os.path.join(self.settings.OUTPUT_DIRECTORY, self.run_id, self.orig.name, ds_expression)
+    ds_dir, ds_pattern = os.path.split(ds_path)
+    try:
+      names = os.listdir(ds_dir)
+    except OSError:
+      names = []
+
     candidates = []
-    for ds in glob.glob(ds_path):
+    for name in names:
+      if not fnmatch.fnmatchcase(name, ds_pattern):
+        continue
+
+      ds = os.path.join(ds_dir, name)
       if not os.path.isfile(ds):
         continue
 
       candidates.append(ds)
 
     try:
-      return sorted(candidates, reverse=True)[0]
+      ds = sorted(candidates, reverse=True)[0]
     except IndexError:
       # Dataset does not exist
       logger.warning("Dataset matching '%s' does not exist for run '%s'!" %
         (ds_expression, self.orig.name))
       raise exceptions.MissingDatasetError
 
-  def sort_dataset(self, ds_expression, column, **kwargs):
-    in_file = self.get_file(ds_expression)
-    out_file = "%s.sorted-%s" % (in_file, column)
-    buffer_size = 32000
-    if os.path.isfile(out_file):
-      return out_file
-
-    def merge(key, *iterables):
-      # based on code posted by Scott David Daniels in c.l.p.
-      # http://groups.google.com/group/comp.lang.python/msg/484f01f1ea3c832d
-
-      Keyed = collections.namedtuple("Keyed", ["key", "obj"])
-      keyed_iterables = [(Keyed(key(obj), obj) for obj in iterable) for iterable in iterables]
-      for element in heapq.merge(*keyed_iterables):
-        yield element.obj
-
-    chunks = []
-    key = None
-    header = None
+    self._file_cache[ds_expression] = ds
+    return ds
+
+  def get_degrees(self, ds_expression):
+    """
+    Returns the node degrees of a graph. In- and out-degrees are also
+    included for directed graphs. The GraphML file is streamed and only
+    edge endpoints are counted, without building a graph object.
+    """
+
     try:
-      with open(in_file, 'rb', 64*1024) as input_file:
-        input_iterator = iter(input_file)
-        # Skip first line that contains the column names
-        header = input_iterator.next()
-        column_index = header.split().index(column)
-        key = lambda line: int(line.split()[column_index])
-
-        while True:
-          current_chunk = list(itertools.islice(input_iterator, buffer_size))
-          if not current_chunk:
-            break
-
-          current_chunk.sort(key=key)
-          output_chunk = open(os.path.join(tempfile.gettempdir(), '%06i' % len(chunks)), 'w+b', 64*1024)
-          chunks.append(output_chunk)
-          output_chunk.writelines(current_chunk)
-          output_chunk.flush()
-          output_chunk.seek(0)
-
-      with open(out_file, 'wb', 64*1024) as output_file:
-        output_file.write(header)
-        output_file.writelines(merge(key, *chunks))
-    finally:
-      for chunk in chunks:
-        try:
-          chunk.close()
-          os.remove(chunk.name)
-        except Exception:
-          pass
+      return self._degree_cache[ds_expression]
+    except KeyError:
+      pass
 
-    return out_file
+    directed = False
+    nodes = {}
+    sources = []
+    targets = []
+    for event, element in ElementTree.iterparse(self.get_file(ds_expression), events=('start', 'end')):
+      if event == 'start':
+        if element.tag == GRAPHML_NS + 'graph':
+          directed = element.get('edgedefault') == 'directed'
+        continue
+
+      if element.tag == GRAPHML_NS + 'node':
+        nodes[element.get('id')] = len(nodes)
+      elif element.tag == GRAPHML_NS + 'edge':
+        sources.append(element.get('source'))
+        targets.append(element.get('target'))
+      else:
+        continue
+
+      element.clear()
+
+    # Map edge endpoints to node indices and count them; endpoints that are
+    # not declared as nodes are counted in an extra bin that is dropped
+    self._edge_count_cache[ds_expression] = len(sources)
+
+    n = len(nodes)
+    sources = numpy.fromiter((nodes.get(node, n) for node in sources), dtype=numpy.intp, count=len(sources))
+    targets = numpy.fromiter((nodes.get(node, n) for node in targets), dtype=numpy.intp, count=len(targets))
+    out_degrees = numpy.bincount(sources, minlength=n + 1)[:n].astype(numpy.int32)
+    in_degrees = numpy.bincount(targets, minlength=n + 1)[:n].astype(numpy.int32)
+    degrees = {'degree': in_degrees + out_degrees}
+    if directed:
+      degrees['in-degree'] = in_degrees
+      degrees['out-degree'] = out_degrees
+
+    self._degree_cache[ds_expression] = degrees
+    return degrees
+
+  def get_edge_count(self, ds_expression):
+    """
+    Returns the number of edges in a graph. The count is obtained while
+    streaming the GraphML file for node degrees, so no graph object is
+    built and the file is parsed at most once.
+    """
 
-  def get_graph(self, ds_expression, **kwargs):
-    return nx.read_graphml(self.get_file(ds_expression), **kwargs)
+    try:
+      return self._edge_count_cache[ds_expression]
+    except KeyError:
+      pass
+
+    self.get_degrees(ds_expression)
+    return self._edge_count_cache[ds_expression]
 
   def get_dataset(self, ds_expression, **kwargs):
-    return pandas.read_csv(self.get_file(ds_expression), sep='\t', **kwargs)
+    # Chunked readers are consumed by the caller, so they can't be reused
+    if 'chunksize' in kwargs or kwargs.get('iterator', False):
+      return pandas.read_csv(self.get_file(ds_expression), sep='\t', **kwargs)
+
+    key = (ds_expression, freeze(kwargs))
+    try:
+      return self._df_cache[key]
+    except KeyError:
+      pass
+
+    data = pandas.read_csv(self.get_file(ds_expression), sep='\t', **kwargs)
+    self._df_cache[key] = data
+    return data
+
+  def get_column(self, ds_expression, column, dtype=numpy.float64, dropna=False):
+    """
+    Returns a single dataset column as a contiguous array of the given type,
+    optionally without missing values. Only this column is parsed and the
+    array is cached, so plotters that only need one column of a dataset
+    share it.
+    """
+
+    key = (ds_expression, column, numpy.dtype(dtype).str, dropna)
+    try:
+      return self._column_cache[key]
+    except KeyError:
+      pass
 
-  def get_sorted_dataset(self, ds_expression, column, **kwargs):
-    return pandas.read_csv(self.sort_dataset(ds_expression, column), sep='\t', **kwargs)
+    values = pandas.read_csv(self.get_file(ds_expression), sep='\t', usecols=[column], dtype={column: dtype},
+      na_values='-')[column].values
+    if dropna:
+      values = values[~numpy.isnan(values)]
+
+    values = numpy.ascontiguousarray(values)
+    self._column_cache[key] = values
+    return values
 
   def get_marker(self, marker):
-    return self.get_dataset("marker-%s-*.csv" % marker)['ts'][0]
+    # Only the first record is needed, so avoid parsing the whole dataset
+    data = pandas.read_csv(self.get_file("marker-%s-*.csv" % marker), sep='\t', nrows=1, usecols=['ts'])
+    return data['ts'].iat[0]
 
 
 class PlotterBase(object):
+  # All plotters draw on a single shared figure and axes, which are cleared
+  # before each plot instead of being recreated
+  _shared_figure = None
+  _shared_axes = None
+
   def __init__(self, graph, run_id, runs, settings):
     self.graph = graph
     self.run_id = run_id
-    self.runs = [RunOutputDescriptor(run_id, run, settings) for run in runs]
+    self.runs = [RunOutputDescriptor.get(run_id, run, settings) for run in runs]
     self.settings = settings
 
     matplotlib.rc('font', **{
@@ -135,6 +308,51 @@ class PlotterBase(object):
       'size': 14.0,
     })
 
+    if PlotterBase._shared_figure is None:
+      PlotterBase._shared_figure = Figure()
+      FigureCanvasAgg(PlotterBase._shared_figure)
+      PlotterBase._shared_axes = PlotterBase._shared_figure.add_subplot(111)
+
+    self._fig = PlotterBase._shared_figure
+
+  def _new_axes(self):
+    """
+    Clears the shared axes and returns them to draw on.
+    """
+
+    ax = PlotterBase._shared_axes
+    ax.cla()
+    return ax
+
+  def close(self):
+    """
+    Releases the plotted artists after all plots have been saved. The
+    figure itself is kept for use by the next plotter.
+    """
+
+    if self._fig is not None:
+      PlotterBase._shared_axes.cla()
+      self._fig = None
+
+  def map_runs(self, function):
+    """
+    Applies a function to all runs and returns the results in run order.
+    Runs are processed by a pool of threads, so that loading of datasets
+    from different runs overlaps.
+
+    :param function: Function that accepts a run output descriptor
+    """
+
+    if len(self.runs) < 2:
+      return [function(run) for run in self.runs]
+
+    pool = multiprocessing.pool.ThreadPool(min(MAX_LOAD_THREADS, len(self.runs)))
+    try:
+      return pool.map(function, self.runs)
+    finally:
+      pool.close()
+      pool.join()
+
   def get_figure_filename(self, suffix=None):
     fname = self.graph.name
     if suffix is not None:
@@ -152,21 +370,12 @@ class PlotterBase(object):
     suitable for black and white viewing.
     """
     MARKERSIZE = 3
-    COLORMAP = {
-      'b': {'marker': None, 'dash': (None,None)},
-      'g': {'marker': None, 'dash': [5,5]},
-      'r': {'marker': None, 'dash': [5,3,1,3]},
-      'c': {'marker': None, 'dash': [1,3]},
-      'm': {'marker': None, 'dash': [5,2,5,2,5,10]},
-      'y': {'marker': None, 'dash': [5,3,1,2,1,10]},
-      'k': {'marker': 'o', 'dash': (None,None)} #[1,2,1,10]}
-    }
 
     for line in ax.get_lines():
       color = line.get_color()
       line.set_color('black')
-      line.set_dashes(COLORMAP[color]['dash'])
-      line.set_marker(COLORMAP[color]['marker'])
+      line.set_dashes(BW_COLORMAP[color]['dash'])
+      line.set_marker(BW_COLORMAP[color]['marker'])
       line.set_markersize(MARKERSIZE)
 
   def get_fake_alpha(self, color, alpha) :
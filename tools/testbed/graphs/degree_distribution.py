@@ -17,10 +17,7 @@
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 #
 
-from . import base
-
-import matplotlib.pyplot as plt
-import statsmodels.api as sm
+from . import _fast, base
 
 
 class DegreeDistribution(base.PlotterBase):
@@ -33,22 +30,20 @@ class DegreeDistribution(base.PlotterBase):
     Plots the CDF of node degrees.
     """
 
-    fig, ax = plt.subplots()
+    fig = self._fig
+    ax = self._new_axes()
 
     # Determine the label variable name
     variable = self.graph.settings.get('variable', 'size')
 
     for run in self.runs:
-      # Load graph
-      graph = run.get_graph(self.graph.settings['graph'])
-
       # Extract degree distribution information
-      degrees = graph.degree().values()
+      degrees = run.get_degrees(self.graph.settings['graph'])['degree']
 
       # Compute ECDF and plot it
-      ecdf = sm.distributions.ECDF(degrees)
+      x, y = base.compact_ecdf(*_fast.ecdf(degrees))
 
-      ax.plot(ecdf.x, ecdf.y, drawstyle='steps', linewidth=2,
+      ax.plot(x, y, drawstyle='steps-post', linewidth=2,
         label="%s = %d" % (variable, run.orig.settings.get(variable, 0)))
 
     ax.set_xlabel('Degree')
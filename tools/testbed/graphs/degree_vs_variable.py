@@ -20,8 +20,8 @@
 
 from . import base
 
-import matplotlib.pyplot as plt
 import numpy
+import pandas
 import scipy.optimize
 
 
@@ -35,7 +35,8 @@ class DegreeVsVariable(base.PlotterBase):
     Plots the degree vs. variable.
     """
 
-    fig, ax = plt.subplots()
+    fig = self._fig
+    ax = self._new_axes()
 
     # Determine the label variable name
     variable = self.graph.settings.get('variable', 'size')
@@ -46,43 +47,42 @@ class DegreeVsVariable(base.PlotterBase):
       'out-degree': "Izhodna stopnja",
     }
 
-    values = {
-      'degree': {},
-      'in-degree': {},
-      'out-degree': {},
-    }
-    for run in self.runs:
-      # Load graph
-      graph = run.get_graph(self.graph.settings['graph'])
-
-      # Extract degree distribution information
-      degrees = graph.degree().values()
-      values['degree'][run.orig.settings[variable]] = (numpy.average(degrees), numpy.std(degrees))
+    # Load degrees of all runs in parallel (in- and out-degrees are only
+    # available for directed graphs)
+    degrees = self.map_runs(lambda run: run.get_degrees(self.graph.settings['graph']))
 
-      if hasattr(graph, 'in_degree'):
-        in_degrees = graph.in_degree().values()
-        out_degrees = graph.out_degree().values()
+    frames = []
+    for run, data in zip(self.runs, degrees):
+      frame = pandas.DataFrame(data)
+      frame['variable'] = run.orig.settings[variable]
+      frames.append(frame)
 
-        values['in-degree'][run.orig.settings[variable]] = (numpy.average(in_degrees), numpy.std(in_degrees))
-        values['out-degree'][run.orig.settings[variable]] = (numpy.average(out_degrees), numpy.std(out_degrees))
+    # Aggregate the samples of all runs with the same variable value
+    values = pandas.concat(frames, ignore_index=True).groupby('variable')
+    averages = values.mean()
+    deviations = values.std(ddof=0)
+    X = averages.index.values.astype(numpy.float64)
 
-    for typ in values:
-      X = sorted(values[typ].keys())
-      Y = [values[typ][x][0] for x in X]
-      Yerr = [values[typ][x][1] for x in X]
+    for typ in ('degree', 'in-degree', 'out-degree'):
+      if typ not in averages:
+        continue
 
-      if X:
-        ax.errorbar(X, Y, Yerr, marker='x', label=labels[typ])
+      ax.errorbar(X, averages[typ].values, deviations[typ].values, marker='x', label=labels[typ])
 
     # Fit a function over the measurements when configured
     fit_function = self.graph.settings.get('fit', None)
     if fit_function is not None:
-      X = sorted(values['degree'].keys())
-      Y = [values['degree'][x][0] for x in X]
+      Y = averages['degree'].values
+
+      # An initial guess and an analytic Jacobian may be configured to avoid
+      # estimating the Jacobian by finite differences
+      fit_args = {'p0': self.graph.settings.get('fit_p0', None)}
+      if self.graph.settings.get('fit_jac', None) is not None:
+        fit_args['jac'] = self.graph.settings['fit_jac']
 
-      popt, pcov = scipy.optimize.curve_fit(fit_function, X, Y)
-      Fx = numpy.linspace(min(X), max(X) + 2*(X[-1] - X[-2]), 100)
-      Fy = [fit_function(x, *popt) for x in Fx]
+      popt, pcov = scipy.optimize.curve_fit(fit_function, X, Y, **fit_args)
+      Fx = numpy.linspace(X[0], X[-1] + 2*(X[-1] - X[-2]), 100)
+      Fy = fit_function(Fx, *popt)
       ax.plot(Fx, Fy, linestyle='--', color='black', label=self.graph.settings.get('fit_label', 'Fit'))
 
     ax.set_xlabel(u'Število vozlišč v osnovni topologiji')
@@ -19,8 +19,7 @@
 
 from . import base
 
-import matplotlib.pyplot as plt
-import numpy
+import pandas
 
 
 class DeliverabilityVsAttackEdges(base.PlotterBase):
@@ -33,30 +32,36 @@ class DeliverabilityVsAttackEdges(base.PlotterBase):
     Plots the deliverability vs. fraction of attack edges.
     """
 
-    fig, ax = plt.subplots()
+    fig = self._fig
+    ax = self._new_axes()
 
-    values = {}
-    for run in self.runs:
+    def load(run):
       # Load dataset
-      data = run.get_dataset("routing-pair_wise_ping-raw-*.csv")
-      # Load input graph
-      graph = run.get_graph("input-topology.graphml")
+      data = run.get_dataset("routing-pair_wise_ping-raw-*.csv",
+        usecols=['success'], dtype={'success': 'bool'})
+      # Determine the size of the input graph
+      edges = run.get_edge_count("input-topology.graphml")
 
       # Extract deliverability information
-      pairs = len(data)
-      delivered = data['success'].sum()
+      pairs = data.shape[0]
+      delivered = int(data['success'].values.sum())
 
-      # Compute fraction of attack edges in the graph
+      # Compute fraction of attack edges in the graph, binned as an integer
+      # percentage so that equal fractions always end up in the same group
       attack_edges = run.orig.settings['attack_edges']
-      edge_fraction = round(attack_edges / float(graph.number_of_edges()), 2)
+      edge_percent = int(round(100.0 * attack_edges / edges))
 
-      values.setdefault(edge_fraction, []).append(delivered / float(pairs))
+      return (edge_percent, delivered / float(pairs))
 
-    X = sorted(values.keys())
-    Y = [numpy.average(values[x]) for x in X]
-    Yerr = [numpy.std(values[x]) for x in X]
+    rows = self.map_runs(load)
 
-    ax.errorbar(X, Y, Yerr, marker='x')
+    # Aggregate all runs with the same fraction of attack edges
+    values = pandas.DataFrame(rows, columns=['edge_percent', 'deliverability'])
+    values = values.groupby('edge_percent')['deliverability']
+    averages = values.mean()
+    deviations = values.std(ddof=0)
+
+    ax.errorbar(averages.index.values / 100.0, averages.values, deviations.values, marker='x')
     ax.set_xlabel('Percentage of attack edges')
     ax.set_ylabel('Deliverability')
     ax.grid()
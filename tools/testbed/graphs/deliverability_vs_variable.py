@@ -19,8 +19,7 @@
 
 from . import base
 
-import matplotlib.pyplot as plt
-import numpy
+import pandas
 
 
 class DeliverabilityVsVariable(base.PlotterBase):
@@ -33,27 +32,32 @@ class DeliverabilityVsVariable(base.PlotterBase):
     Plots the deliverability vs. variable.
     """
 
-    fig, ax = plt.subplots()
+    fig = self._fig
+    ax = self._new_axes()
 
     # Determine the label variable name
     variable = self.graph.settings.get('variable', 'size')
 
-    values = {}
-    for run in self.runs:
+    def load(run):
       # Load dataset
-      data = run.get_dataset("routing-pair_wise_ping-raw-*.csv")
+      data = run.get_dataset("routing-pair_wise_ping-raw-*.csv",
+        usecols=['success'], dtype={'success': 'bool'})
 
       # Extract deliverability information
-      pairs = len(data)
-      delivered = data['success'].sum()
+      pairs = data.shape[0]
+      delivered = int(data['success'].values.sum())
 
-      values.setdefault(run.orig.settings[variable], []).append(delivered / float(pairs))
+      return (run.orig.settings[variable], delivered / float(pairs))
 
-    X = sorted(values.keys())
-    Y = [numpy.average(values[x]) for x in X]
-    Yerr = [numpy.std(values[x]) for x in X]
+    rows = self.map_runs(load)
 
-    ax.errorbar(X, Y, Yerr, marker='x')
+    # Aggregate all runs with the same variable value
+    values = pandas.DataFrame(rows, columns=['variable', 'deliverability'])
+    values = values.groupby('variable')['deliverability']
+    averages = values.mean()
+    deviations = values.std(ddof=0)
+
+    ax.errorbar(averages.index.values, averages.values, deviations.values, marker='x')
     ax.set_xlabel(variable.capitalize().replace('_', ' '))
     ax.set_ylabel('Deliverability')
     ax.grid()
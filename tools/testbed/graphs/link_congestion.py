@@ -18,10 +18,12 @@
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 #
 
-from . import base
+from . import _fast, base
 
-import matplotlib.pyplot as plt
-import statsmodels.api as sm
+from matplotlib.collections import LineCollection
+from matplotlib.lines import Line2D
+
+import numpy
 
 
 class LinkCongestion(base.PlotterBase):
@@ -34,38 +36,60 @@ class LinkCongestion(base.PlotterBase):
     Plots the CDF of link load.
     """
 
-    fig, ax = plt.subplots()
+    fig = self._fig
+    ax = self._new_axes()
+
+    # Left limit of the x axis, points before it are not drawn
+    XMIN = 28
 
+    # All ECDF traces are drawn as a single collection with explicit step
+    # vertices and get a proxy artist for the legend
+    segments = []
+    labels = []
     for run in self.runs:
       # Load datasets
-      data_measure = run.get_dataset("stats-collect_link_congestion-raw-*.csv")
-      data_sp = run.get_dataset("stats-collect_link_congestion-sp-*.csv")
-
-      # Extract link congestion information
-      data_measure = data_measure['msgs']
-      data_sp = data_sp['msgs']
-
-      # Compute ECDF and plot it
-      ecdf_measure = sm.distributions.ECDF(data_measure)
-      ecdf_sp = sm.distributions.ECDF(data_sp)
+      data_measure = run.get_dataset("stats-collect_link_congestion-raw-*.csv", usecols=['msgs'])
+      data_sp = run.get_dataset("stats-collect_link_congestion-sp-*.csv", usecols=['msgs'])
 
       variable_label = ""
       size = run.orig.settings.get('size', None)
       if size is not None:
         variable_label = " (n=%d)" % size
 
-      ax.plot(ecdf_measure.x, ecdf_measure.y, drawstyle='steps', linewidth=2,
-        label="U-Sphere%s" % variable_label)
-      ax.plot(ecdf_sp.x, ecdf_sp.y, drawstyle='steps', linewidth=2,
-        label=u"Klasični usmerjevalni protokol%s" % variable_label)
+      # Compute ECDF step vertices
+      for data, label in ((data_measure['msgs'], "U-Sphere%s" % variable_label),
+                          (data_sp['msgs'], u"Klasični usmerjevalni protokol%s" % variable_label)):
+        x, y = base.compact_ecdf(*_fast.ecdf(data.values), xmin=XMIN)
+
+        segments.append(numpy.column_stack([numpy.repeat(x, 2)[1:], numpy.repeat(y, 2)[:-1]]))
+        labels.append(label)
+
+    # Black and white styles follow the default color cycle
+    styles = []
+    proxies = []
+    for index in xrange(len(segments)):
+      dash = base.BW_COLORMAP[base.BW_COLOR_CYCLE[index % len(base.BW_COLOR_CYCLE)]]['dash']
+      proxy = Line2D([], [], color='black', linewidth=2)
+      if dash[0] is None:
+        styles.append('solid')
+      else:
+        styles.append((0, dash))
+        proxy.set_dashes(dash)
+      proxies.append(proxy)
+
+    # Traces are rasterized so that vector output does not contain every vertex,
+    # while axes and labels remain vector graphics
+    traces = LineCollection(segments, linewidths=2, colors='black', linestyles=styles)
+    traces.set_rasterized(True)
+    ax.add_collection(traces)
+    ax.autoscale_view()
 
     ax.set_xlabel('Obremenjenost povezave')
     ax.set_ylabel('Kumulativna verjetnost')
     ax.grid()
-    ax.axis((28, None, 0.99, 1.0005))
-    self.convert_axes_to_bw(ax)
+    ax.axis((XMIN, None, 0.99, 1.0005))
 
-    legend = ax.legend(loc='lower right')
+    legend = ax.legend(proxies, labels, loc='lower right')
     if self.settings.GRAPH_TRANSPARENCY:
       legend.get_frame().set_alpha(0.8)
-    fig.savefig(self.get_figure_filename())
+    fig.savefig(self.get_figure_filename(), dpi=self.settings.GRAPH_RASTER_DPI)
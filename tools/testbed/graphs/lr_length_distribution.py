@@ -17,10 +17,7 @@
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 #
 
-from . import base
-
-import matplotlib.pyplot as plt
-import statsmodels.api as sm
+from . import _fast, base
 
 
 class LRLengthDistribution(base.PlotterBase):
@@ -33,20 +30,23 @@ class LRLengthDistribution(base.PlotterBase):
     Plots the CDF of L-R address length distribution.
     """
 
-    fig, ax = plt.subplots()
+    fig = self._fig
+    ax = self._new_axes()
 
-    for run in self.runs:
-      # Load dataset
-      data_primary = run.get_dataset("stats-lr_address_lengths-primary-*.csv")
-      data_secondary = run.get_dataset("stats-lr_address_lengths-secondary-*.csv")
+    # Load datasets of all runs in parallel
+    datasets = self.map_runs(lambda run: (
+      run.get_dataset("stats-lr_address_lengths-primary-*.csv"),
+      run.get_dataset("stats-lr_address_lengths-secondary-*.csv"),
+    ))
 
+    for run, (data_primary, data_secondary) in zip(self.runs, datasets):
       # Compute ECDF and plot it
-      ecdf_primary = sm.distributions.ECDF(data_primary['length'])
-      ecdf_secondary = sm.distributions.ECDF(data_secondary['length'])
+      x_primary, y_primary = base.compact_ecdf(*_fast.ecdf(data_primary['length'].values), xmin=0.0)
+      x_secondary, y_secondary = base.compact_ecdf(*_fast.ecdf(data_secondary['length'].values), xmin=0.0)
 
-      ax.plot(ecdf_primary.x, ecdf_primary.y, drawstyle='steps', linewidth=2,
+      ax.plot(x_primary, y_primary, drawstyle='steps-post', linewidth=2,
         label="Primary (n = %d)" % run.orig.settings.get('size', 0))
-      ax.plot(ecdf_secondary.x, ecdf_secondary.y, drawstyle='steps', linewidth=2,
+      ax.plot(x_secondary, y_secondary, drawstyle='steps-post', linewidth=2,
         label="Secondary (n = %d)" % run.orig.settings.get('size', 0))
 
     ax.set_xlabel('L-R Address Length')
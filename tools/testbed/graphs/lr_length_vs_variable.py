@@ -20,8 +20,7 @@
 
 from . import base
 
-import matplotlib.pyplot as plt
-import numpy
+import pandas
 
 
 class LRLengthVsVariable(base.PlotterBase):
@@ -34,27 +33,30 @@ class LRLengthVsVariable(base.PlotterBase):
     Plots the L-R address length vs. variable.
     """
 
-    fig, ax = plt.subplots()
+    fig = self._fig
+    ax = self._new_axes()
 
     # Determine the label variable name
     variable = self.graph.settings.get('variable', 'size')
     variable_label = self.graph.settings.get('variable_label', variable.capitalize().replace('_', ' '))
 
-    values = {
-      'primary': {},
-      'secondary': {},
-    }
-    for run in self.runs:
-      # Load datasets
-      data_primary = run.get_dataset("stats-lr_address_lengths-primary-*.csv")
-      data_secondary = run.get_dataset("stats-lr_address_lengths-secondary-*.csv")
+    types = ('primary', 'secondary')
+
+    # Load length information of all runs in parallel
+    lengths = self.map_runs(lambda run: [
+      run.get_dataset("stats-lr_address_lengths-%s-*.csv" % typ)['length'].values
+      for typ in types
+    ])
 
-      # Extract length information
-      primary = data_primary['length']
-      secondary = data_secondary['length']
+    frames = []
+    for run, data in zip(self.runs, lengths):
+      for typ, length in zip(types, data):
+        frames.append(pandas.DataFrame({'type': typ, 'variable': run.orig.settings[variable], 'length': length}))
 
-      values['primary'][run.orig.settings[variable]] = (numpy.average(primary), numpy.std(primary))
-      values['secondary'][run.orig.settings[variable]] = (numpy.average(secondary), numpy.std(secondary))
+    # Aggregate the samples of all runs with the same variable value
+    values = pandas.concat(frames, ignore_index=True).groupby(['type', 'variable'])['length']
+    averages = values.mean()
+    deviations = values.std(ddof=0)
 
     dash = {
       'primary': (None, None),
@@ -66,11 +68,9 @@ class LRLengthVsVariable(base.PlotterBase):
       'secondary': 'Sekundarni',
     }
 
-    for typ in values:
-      X = sorted(values[typ].keys())
-      Y = [values[typ][x][0] for x in X]
-      Yerr = [values[typ][x][1] for x in X]
-      ax.errorbar(X, Y, Yerr, marker='x', color='black', dashes=dash[typ], label=labels[typ])
+    for typ in types:
+      ax.errorbar(averages[typ].index.values, averages[typ].values, deviations[typ].values, marker='x',
+        color='black', dashes=dash[typ], label=labels[typ])
 
     ax.set_xlabel(variable_label)
     ax.set_ylabel(u'Dolžina naslova L-R')
@@ -18,11 +18,10 @@
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 #
 
-from . import base
+from . import _fast, base
 
 import itertools
 import matplotlib as mpl
-import matplotlib.pyplot as plt
 import numpy
 import pandas
 
@@ -36,64 +35,60 @@ class MessagingPerformance(base.PlotterBase):
     """
     Performs pre-processing of the data so that the timeseries is grouped
     by timestamps and nodes in order to be processed correctly later on.
+    Returns the timestamps (relative to the first one) and a frame with
+    per-timestamp averages of all variables over all nodes.
     """
 
-    chunks = run.get_dataset("stats-collect_performance-raw-*.csv", chunksize=5000)
-    ts_base, groups = None, set()
-    for chunk in chunks:
-      if ts_base is None:
-        ts_base = min(chunk['ts'])
-      else:
-        ts_base = min(ts_base, min(chunk['ts']))
-
-      groups.update(chunk['node_id'].unique())
-
-    grouped_data = {}
-    prev_ts = None
-    current_ts = 0
-    missing_values = []
-
-    chunks = run.get_sorted_dataset("stats-collect_performance-raw-*.csv", "ts", chunksize=5000)
-    for chunk in chunks:
-      for _, element in chunk.iterrows():
-        element_ts = element['ts'] - ts_base
-        assert element_ts >= current_ts
-        grouped_data.setdefault(element_ts, {})[element['node_id']] = element
-        if current_ts != element_ts:
-          # New timestamp, check if we have missed any nodes and include their previous
-          # values in this timestamp -- this is to ensure that there are no weird jumps
-          # when computing the rate of change
-          if len(grouped_data[current_ts]) != len(groups):
-            for group in groups.difference(grouped_data[current_ts].keys()):
-              if prev_ts is not None:
-                grouped_data[current_ts][group] = grouped_data[prev_ts][group]
-              else:
-                grouped_data[current_ts][group] = None
-
-              if grouped_data[current_ts][group] is None:
-                missing_values.append((current_ts, group))
-
-          # Check if there were any missing values and fill them in as soon as we get the value
-          # (to ensure that the rate of change is zero)
-          for ts, group in missing_values:
-            value = grouped_data[current_ts][group]
-            if value is not None:
-              grouped_data[ts][group] = value
-
-          # Now that we have all data, compute averages for all values so we don't have
-          # to keep this much data in memory
-          if prev_ts is not None:
-            group_sum = {}
-            for v in variables:
-              group_sum[v] = numpy.average([x[v] for x in grouped_data[prev_ts].itervalues()])
-            grouped_data[prev_ts] = group_sum
-
-          prev_ts = current_ts
-          current_ts = element_ts
-
-    timestamps = numpy.asarray(sorted(grouped_data.keys()))
-
-    return timestamps, grouped_data
+    # The dataset is streamed in chunks and is not cached, as it is only needed
+    # here; counters are stored compactly when they fit
+    chunks = run.get_dataset("stats-collect_performance-raw-*.csv", usecols=['ts', 'node_id'] + variables,
+      chunksize=50000)
+    node_ids = {}
+    data = pandas.concat([self.compact_chunk(chunk, variables, node_ids) for chunk in chunks], ignore_index=True)
+
+    # Arrange values in a (timestamp x node x variable) array, keeping the last
+    # sample of each node at each timestamp
+    ts_values, ts_index = numpy.unique(data['ts'].values, return_inverse=True)
+    cells = ts_index * len(node_ids) + data['node_id'].values
+    _, last = numpy.unique(cells[::-1], return_index=True)
+    last = len(cells) - 1 - last
+
+    values = numpy.full((len(ts_values), len(node_ids), len(variables)), numpy.nan)
+    values[ts_index[last], data['node_id'].values[last]] = data[variables].values[last]
+
+    # Nodes that have not reported at some timestamp keep their previous values,
+    # so there are no weird jumps when computing the rate of change; nodes that
+    # have not reported yet take their first reported value (to ensure that the
+    # rate of change is zero)
+    values = _fast.fill_missing(values.reshape(len(ts_values), -1)).reshape(values.shape)
+
+    # Average all values over nodes
+    averages = pandas.DataFrame(values.mean(axis=1), index=ts_values, columns=variables)
+    timestamps = ts_values - ts_values[0]
+
+    return timestamps, averages
+
+  def compact_chunk(self, chunk, variables, node_ids):
+    """
+    Replaces node identifiers in a dataset chunk by integer codes and
+    downcasts integer counters to 32-bit integers when their values fit.
+
+    :param node_ids: Mapping of node identifiers to codes, shared by all
+      chunks of a dataset
+    """
+
+    # Only the distinct identifiers of each chunk are looked up in the mapping
+    labels, uniques = pandas.factorize(chunk['node_id'])
+    codes = numpy.fromiter((node_ids.setdefault(node, len(node_ids)) for node in uniques),
+      dtype=numpy.int32, count=len(uniques))
+    chunk['node_id'] = codes[labels]
+
+    for v in variables:
+      column = chunk[v]
+      if column.dtype.kind == 'i' and column.min() >= -2**31 and column.max() < 2**31:
+        chunk[v] = column.astype(numpy.int32)
+
+    return chunk
 
   def compute_rate(self, timestamps, grouped_data, variable):
     """
@@ -102,22 +97,18 @@ class MessagingPerformance(base.PlotterBase):
 
     # Extract variable from the grouped dataset
     X = timestamps[:-10]
-    Y = [grouped_data[x][variable] for x in X]
+    Y = grouped_data[variable].values[:-10]
 
     # Compute rate from absolute counter values
-    Yrate = []
-    for x1, x2, y1, y2 in zip(X, X[1:], Y, Y[1:]):
-      Yrate += [(y2 - y1) / (x2 - x1)]
-
-    return X[1:], Yrate
+    return X[1:], numpy.diff(Y) / numpy.diff(X)
 
   def compute_average(self, X, Y, x_min):
     """
     Computes average and standard deviation.
     """
 
-    Yf = [y for x, y in zip(X, Y) if x >= x_min]
-    return numpy.average(Yf), numpy.std(Yf)
+    Yf = numpy.asarray(Y)[numpy.asarray(X) >= x_min]
+    return Yf.mean(), Yf.std()
 
   def plot_variable(self, ax, X, Yrate, color, label):
     """
@@ -132,25 +123,32 @@ class MessagingPerformance(base.PlotterBase):
 
     # Also plot the moving average
     w = 60
-    Ymean = numpy.asarray(pandas.rolling_mean(pandas.Series([0]*w + Yrate), w))
-    ax.plot(X, Ymean[w:], label=label, color=color, zorder=1)
+    Ymean = numpy.convolve(Yrate, numpy.ones(w) / w)[:len(Yrate)]
+    ax.plot(X, Ymean, label=label, color=color, zorder=1)
 
   def plot(self):
     """
     Plots the messaging performance.
     """
 
-    fig, ax = plt.subplots()
+    fig = self._fig
+    ax = self._new_axes()
 
     # Determine the label attribute name
     label_attribute = self.graph.settings.get('label_attribute', 'size')
     label_attribute_dsc = self.graph.settings.get('label_attribute_dsc', u'Število vozlišč')
 
-    min_max_ts = None
+    max_ts = []
     averages = {
       'sg_msgs': {},
       'rt_msgs': {},
     }
+    # Colors of all runs are looked up at once
+    shades = numpy.arange(len(self.runs), dtype=numpy.float64) / len(self.runs)
+    sg_colors = mpl.cm.winter(shades)
+    rt_colors = mpl.cm.autumn(shades)
+    sa_colors = mpl.cm.summer(shades)
+
     for i, run in enumerate(self.runs):
       run_attribute = run.orig.settings.get(label_attribute, 0)
 
@@ -168,11 +166,11 @@ class MessagingPerformance(base.PlotterBase):
         additional_label = ''
 
       # Plot variables
-      self.plot_variable(ax, sX, sYrate, mpl.cm.winter(float(i) / len(self.runs)),
+      self.plot_variable(ax, sX, sYrate, sg_colors[i],
         'Zapisi SG' + additional_label)
-      self.plot_variable(ax, rX, rYrate, mpl.cm.autumn(float(i) / len(self.runs)),
+      self.plot_variable(ax, rX, rYrate, rt_colors[i],
         'Zapisi RT' + additional_label)
-      self.plot_variable(ax, saX, saYrate, mpl.cm.summer(float(i) / len(self.runs)),
+      self.plot_variable(ax, saX, saYrate, sa_colors[i],
         'Zapisi SA' + additional_label)
 
       # Retrieve the moment in time when all nodes are considered up and compute average rates
@@ -180,13 +178,12 @@ class MessagingPerformance(base.PlotterBase):
       averages['sg_msgs'][run_attribute] = self.compute_average(sX, sYrate, nodes_up_ts)
       averages['rt_msgs'][run_attribute] = self.compute_average(rX, rYrate, nodes_up_ts)
 
-      # Compute the minimum of all maximum timestamps
-      if min_max_ts is None or timestamps[-1] < min_max_ts:
-        min_max_ts = timestamps[-1]
+      max_ts.append(timestamps[-1])
 
     ax.set_xlabel(u'Čas [s]')
     ax.set_ylabel('Zapisi/s')
-    ax.set_xlim(0, min_max_ts)
+    # Only show the time span covered by all runs
+    ax.set_xlim(0, numpy.min(max_ts))
     ax.grid()
 
     if self.graph.settings.get('legend', True):
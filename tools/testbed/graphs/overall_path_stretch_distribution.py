@@ -21,8 +21,7 @@
 from . import base
 
 import matplotlib as mpl
-import matplotlib.pyplot as plt
-import statsmodels.api as sm
+import numpy
 
 
 class OverallPathStretchDistribution(base.PlotterBase):
@@ -35,7 +34,8 @@ class OverallPathStretchDistribution(base.PlotterBase):
     Plots the CDF of path stretch.
     """
 
-    fig, ax = plt.subplots()
+    fig = self._fig
+    ax = self._new_axes()
 
     for cfg in self.graph.settings['topologies']:
       count_all = 2.0
@@ -53,19 +53,18 @@ class OverallPathStretchDistribution(base.PlotterBase):
         if run.orig.settings['topology'].name not in cfg['topology']:
           continue
 
-        # Load dataset
-        data = run.get_dataset("routing-pair_wise_ping-stretch-*.csv")
-        data = data['stretch'].dropna()
+        # Load stretch information
+        data = run.get_column("routing-pair_wise_ping-stretch-*.csv", 'stretch', numpy.float32, dropna=True)
 
         # Compute ECDF
-        ecdf = sm.distributions.ECDF(data)
+        x, y = base.resample_ecdf(numpy.sort(data))
 
         legend_label = cfg.get('legend', None)
         variable = cfg.get('variable', None)
         if legend_label and variable:
           legend_label = legend_label % run.orig.settings[variable]
 
-        ax.plot(ecdf.x, ecdf.y, drawstyle='steps', linewidth=2, color=color(count_current / count_all),
+        ax.plot(x, y, drawstyle='steps-post', linewidth=2, color=color(count_current / count_all),
           label=legend_label)
 
         count_current += 1
@@ -20,8 +20,7 @@
 
 from . import base
 
-import matplotlib.pyplot as plt
-import statsmodels.api as sm
+import numpy
 
 
 class PathStretchDistribution(base.PlotterBase):
@@ -34,28 +33,27 @@ class PathStretchDistribution(base.PlotterBase):
     Plots the CDF of path stretch.
     """
 
-    fig, ax = plt.subplots()
+    fig = self._fig
+    ax = self._new_axes()
 
     # Determine the label variable name
     variable = self.graph.settings.get('variable', None)
     variable_label = self.graph.settings.get('variable_label', variable)
 
-    for run in self.runs:
-      # Load dataset
-      data = run.get_dataset("routing-pair_wise_ping-stretch-*.csv")
-
-      # Extract stretch information
-      data = data['stretch'].dropna()
+    # Load stretch information of all runs in parallel
+    stretches = self.map_runs(
+      lambda run: run.get_column("routing-pair_wise_ping-stretch-*.csv", 'stretch', numpy.float32, dropna=True))
 
+    for run, data in zip(self.runs, stretches):
       # Compute ECDF and plot it
-      ecdf = sm.distributions.ECDF(data)
+      x, y = base.resample_ecdf(numpy.sort(data))
 
       if variable is not None:
         ecdf_label = "%s = %d" % (variable_label, run.orig.settings.get(variable, 0))
       else:
         ecdf_label = None
 
-      ax.plot(ecdf.x, ecdf.y, drawstyle='steps', linewidth=2, label=ecdf_label)
+      ax.plot(x, y, drawstyle='steps-post', linewidth=2, label=ecdf_label)
 
     ax.set_xlabel('Razteg poti')
     ax.set_ylabel('Kumulativna verjetnost')
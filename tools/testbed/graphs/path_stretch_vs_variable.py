@@ -20,8 +20,8 @@
 
 from . import base
 
-import matplotlib.pyplot as plt
 import numpy
+import pandas
 
 
 class PathStretchVsVariable(base.PlotterBase):
@@ -34,25 +34,26 @@ class PathStretchVsVariable(base.PlotterBase):
     Plots the path stretch growth.
     """
 
-    fig, ax = plt.subplots()
+    fig = self._fig
+    ax = self._new_axes()
 
     # Determine the label variable name
     variable = self.graph.settings.get('variable', 'size')
     variable_label = self.graph.settings.get('variable_label', variable.capitalize())
 
-    averages = {}
-    for run in self.runs:
-      # Load dataset
-      data = run.get_dataset("routing-pair_wise_ping-stretch-*.csv")
+    # Load stretch information of all runs in parallel
+    stretches = self.map_runs(
+      lambda run: run.get_column("routing-pair_wise_ping-stretch-*.csv", 'stretch', numpy.float32, dropna=True))
 
-      # Extract stretch information
-      data = data['stretch'].dropna()
-      averages[run.orig.settings.get(variable, 0)] = (numpy.average(data), numpy.std(data))
+    frames = []
+    for run, data in zip(self.runs, stretches):
+      frames.append(pandas.DataFrame({'variable': run.orig.settings.get(variable, 0), 'stretch': data}))
 
-    X = sorted(averages.keys())
-    Y = [averages[x][0] for x in X]
-    Yerr = [averages[x][1] for x in X]
-    ax.errorbar(X, Y, Yerr, color='black', linestyle='-', marker='x')
+    # Aggregate the samples of all runs with the same variable value
+    values = pandas.concat(frames, ignore_index=True).groupby('variable')['stretch']
+    averages = values.mean()
+    deviations = values.std(ddof=0)
+    ax.errorbar(averages.index.values, averages.values, deviations.values, color='black', linestyle='-', marker='x')
 
     ax.set_xlabel(variable_label)
     ax.set_ylabel('Razteg poti')
@@ -18,10 +18,7 @@
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 #
 
-from . import base
-
-import matplotlib.pyplot as plt
-import statsmodels.api as sm
+from . import _fast, base
 
 
 class StateDistribution(base.PlotterBase):
@@ -34,7 +31,8 @@ class StateDistribution(base.PlotterBase):
     Plots the CDF of path stretch.
     """
 
-    fig, ax = plt.subplots()
+    fig = self._fig
+    ax = self._new_axes()
 
     for run in self.runs:
       # Load dataset
@@ -44,9 +42,9 @@ class StateDistribution(base.PlotterBase):
       data = data['rt_s_act'] + data['ndb_s_act']
 
       # Compute ECDF and plot it
-      ecdf = sm.distributions.ECDF(data)
+      x, y = base.compact_ecdf(*_fast.ecdf(data.values))
 
-      ax.plot(ecdf.x, ecdf.y, drawstyle='steps', linewidth=2,
+      ax.plot(x, y, drawstyle='steps-post', linewidth=2,
         label="n = %d" % run.orig.settings.get('size', 0))
 
     ax.set_xlabel(u'Število vnosov')
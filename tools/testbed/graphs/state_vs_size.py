@@ -21,8 +21,8 @@
 from . import base
 from .. import exceptions
 
-import matplotlib.pyplot as plt
 import numpy
+import pandas
 import scipy.optimize
 
 
@@ -36,13 +36,14 @@ class StateVsSize(base.PlotterBase):
     Plots the state growth.
     """
 
-    fig, ax = plt.subplots()
+    fig = self._fig
+    ax = self._new_axes()
 
-    values = {}
-    for run in self.runs:
-      # Load dataset
-      data = run.get_dataset("stats-performance-raw-*.csv")
+    # Load datasets of all runs in parallel
+    datasets = self.map_runs(lambda run: run.get_dataset("stats-performance-raw-*.csv"))
 
+    frames = []
+    for run, data in zip(self.runs, datasets):
       # Extract values
       try:
         data = data[self.graph.settings['state']]
@@ -50,22 +51,32 @@ class StateVsSize(base.PlotterBase):
         raise exceptions.ImproperlyConfigured("State vs. size plot requires the 'state' tag to be set!")
 
       try:
-        values[run.orig.settings['size']] = (numpy.average(data), numpy.std(data))
+        frames.append(pandas.DataFrame({'size': run.orig.settings['size'], 'state': data.values}))
       except KeyError:
         raise exceptions.ImproperlyConfigured("State vs. size plot requires the 'size' tag to be set!")
 
-    X = sorted(values.keys())
-    Y = [values[x][0] for x in X]
-    Yerr = [values[x][1] for x in X]
+    # Aggregate the samples of all runs with the same size
+    values = pandas.concat(frames, ignore_index=True).groupby('size')['state']
+    averages = values.mean()
+    deviations = values.std(ddof=0)
+    X = averages.index.values.astype(numpy.float64)
+    Y = averages.values
 
-    ax.errorbar(X, Y, Yerr, marker='x', color='black', label='Meritve')
+    ax.errorbar(X, Y, deviations.values, marker='x', color='black', label='Meritve')
 
-    # Fit a function over the measurements when configured
+    # Fit a function over the measurements when configured; the function is
+    # evaluated on whole arrays, so it must be written with NumPy operations
     fit_function = self.graph.settings.get('fit', None)
     if fit_function is not None:
-      popt, pcov = scipy.optimize.curve_fit(fit_function, X, Y)
-      Fx = numpy.linspace(min(X), max(X) + 1*(X[-1] - X[-2]), 100)
-      Fy = [fit_function(x, *popt) for x in Fx]
+      # An initial guess and an analytic Jacobian may be configured to avoid
+      # estimating the Jacobian by finite differences
+      fit_args = {'p0': self.graph.settings.get('fit_p0', None)}
+      if self.graph.settings.get('fit_jac', None) is not None:
+        fit_args['jac'] = self.graph.settings['fit_jac']
+
+      popt, pcov = scipy.optimize.curve_fit(fit_function, X, Y, **fit_args)
+      Fx = numpy.linspace(X[0], X[-1] + 1*(X[-1] - X[-2]), 100)
+      Fy = fit_function(Fx, *popt)
       ax.plot(Fx, Fy, linestyle='--', color='black', label=self.graph.settings.get('fit_label', 'Fit'))
 
     ax.set_xlabel(u'Število vozlišč')
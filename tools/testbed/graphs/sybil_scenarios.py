@@ -20,8 +20,8 @@
 
 from . import base
 
-import matplotlib.pyplot as plt
 import numpy
+import pandas
 
 
 class SybilScenarios(base.PlotterBase):
@@ -34,26 +34,25 @@ class SybilScenarios(base.PlotterBase):
     Plots the deliverability and resolvability  vs. fraction of attack edges.
     """
 
-    fig, ax = plt.subplots()
+    fig = self._fig
+    ax = self._new_axes()
 
-    values = {
-      'scenario_a': {},
-      'scenario_b': {},
-      'scenario_c': {},
-    }
+    rows = []
     for run in self.runs:
-      # Load input graph
-      graph = run.get_graph("input-topology.graphml")
+      # Determine the size of the input graph
+      edges = run.get_edge_count("input-topology.graphml")
 
-      # Compute fraction of attack edges in the graph
+      # Compute fraction of attack edges in the graph, binned as an integer
+      # percentage so that equal fractions always end up in the same group
       attack_edges = run.orig.settings['attack_edges']
-      edge_fraction = round(attack_edges / float(graph.number_of_edges()), 2)
+      edge_percent = int(round(100.0 * attack_edges / edges))
 
       # Obtain scenario name
       scenario = run.orig.settings['scenario']
 
       if scenario in ("SybilNodesNames", "SybilNodesNamesLandmarks"):
-        data_resolvability = run.get_dataset("sanity-check_consistent_ndb-report-*.csv")
+        data_resolvability = run.get_dataset("sanity-check_consistent_ndb-report-*.csv",
+          usecols=['ratio'], dtype={'ratio': 'float32'})
 
         # Extract resolvability information
         resolved = float(data_resolvability['ratio'].sum())
@@ -63,15 +62,16 @@ class SybilScenarios(base.PlotterBase):
         elif scenario == "SybilNodesNamesLandmarks":
           scenario_key = 'scenario_b'
 
-        values[scenario_key].setdefault(edge_fraction, []).append(resolved)
+        rows.append((scenario_key, edge_percent, resolved))
       elif scenario == "SybilNodesRouting":
-        data_deliverability = run.get_dataset("routing-pair_wise_ping-raw-*.csv")
+        data_deliverability = run.get_dataset("routing-pair_wise_ping-raw-*.csv",
+          usecols=['success'], dtype={'success': 'bool'})
 
         # Extract deliverability information
-        pairs = len(data_deliverability)
-        delivered = data_deliverability['success'].sum()
+        pairs = data_deliverability.shape[0]
+        delivered = int(data_deliverability['success'].values.sum())
 
-        values['scenario_c'].setdefault(edge_fraction, []).append(delivered / float(pairs))
+        rows.append(('scenario_c', edge_percent, delivered / float(pairs)))
 
     designs = [
       ('scenario_a', {'label': "Preslikani pari (scenarij A)", 'dashes': (None, None), 'marker': '^', 'color': 'black'}),
@@ -79,13 +79,18 @@ class SybilScenarios(base.PlotterBase):
       ('scenario_c', {'label': u"Dostavljena sporočila (scenarij C)", 'dashes': (5, 5), 'marker': 'x', 'color': 'blue'}),
     ]
 
-    for scenario_name, design in designs:
-      data = values[scenario_name]
-      X = sorted(data.keys())
-      Y = [numpy.average(data[x]) for x in X]
-      Yerr = [numpy.std(data[x]) for x in X]
+    # Aggregate all runs of a scenario with the same fraction of attack edges
+    values = pandas.DataFrame(rows, columns=['scenario', 'edge_percent', 'value'])
+    values = values.groupby(['scenario', 'edge_percent'])['value']
+    averages = values.mean()
+    deviations = values.std(ddof=0)
+    scenarios = averages.index.get_level_values('scenario')
+    edge_percents = averages.index.get_level_values('edge_percent')
 
-      ax.errorbar(X, Y, Yerr, **design)
+    for scenario_name, design in designs:
+      selected = numpy.asarray(scenarios == scenario_name)
+      ax.errorbar(numpy.asarray(edge_percents[selected], dtype=numpy.float64) / 100.0,
+        averages.values[selected], deviations.values[selected], **design)
 
     ax.set_xlabel(u'Delež napadenih povezav')
     ax.grid()
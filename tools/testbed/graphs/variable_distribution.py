@@ -17,10 +17,7 @@
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 #
 
-from . import base
-
-import matplotlib.pyplot as plt
-import statsmodels.api as sm
+from . import _fast, base
 
 
 class VariableDistribution(base.PlotterBase):
@@ -33,7 +30,8 @@ class VariableDistribution(base.PlotterBase):
     Plots the CDF of some variable.
     """
 
-    fig, ax = plt.subplots()
+    fig = self._fig
+    ax = self._new_axes()
 
     # Determine the label variable name
     variable = self.graph.settings['variable']
@@ -46,9 +44,9 @@ class VariableDistribution(base.PlotterBase):
       data = data[variable]
 
       # Compute ECDF and plot it
-      ecdf = sm.distributions.ECDF(data)
+      x, y = base.compact_ecdf(*_fast.ecdf(data.values))
 
-      ax.plot(ecdf.x, ecdf.y, drawstyle='steps', linewidth=2)
+      ax.plot(x, y, drawstyle='steps-post', linewidth=2)
 
     ax.set_xlabel(variable.capitalize())
     ax.set_ylabel('Kumulativna verjetnost')
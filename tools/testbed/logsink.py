@@ -0,0 +1,133 @@
+#
+# This file is part of UNISPHERE.
+#
+# Copyright (C) 2013 Jernej Kos <jernej@kos.mx>
+#
+# This library is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+import atexit
+import logging
+import Queue
+import threading
+
+
+class QueueHandler(logging.Handler):
+  """
+  Logging handler that only enqueues records so that formatting and
+  output happen on the listener thread.
+  """
+
+  def __init__(self, queue):
+    """
+    Class constructor.
+
+    :param queue: Queue to put records into
+    """
+
+    logging.Handler.__init__(self)
+    self.queue = queue
+
+  def prepare(self, record):
+    """
+    Merges message arguments and exception information into the record
+    so that it can be safely handled from another thread.
+    """
+
+    record.msg = record.getMessage()
+    record.args = None
+    if record.exc_info:
+      record.exc_text = logging.Formatter().formatException(record.exc_info)
+      record.exc_info = None
+    return record
+
+  def emit(self, record):
+    try:
+      self.queue.put_nowait(self.prepare(record))
+    except (KeyboardInterrupt, SystemExit):
+      raise
+    except:
+      self.handleError(record)
+
+
+class QueueListener(object):
+  """
+  Background thread that dispatches queued records to the actual
+  handlers.
+  """
+
+  _sentinel = None
+
+  def __init__(self, queue, handlers):
+    """
+    Class constructor.
+
+    :param queue: Queue to take records from
+    :param handlers: A list of target handlers
+    """
+
+    self.queue = queue
+    self.handlers = handlers
+    self._thread = None
+
+  def start(self):
+    """
+    Starts the listener thread.
+    """
+
+    self._thread = threading.Thread(target=self._monitor)
+    self._thread.daemon = True
+    self._thread.start()
+
+  def stop(self):
+    """
+    Processes all pending records and stops the listener thread.
+    """
+
+    if self._thread is None:
+      return
+
+    self.queue.put_nowait(self._sentinel)
+    self._thread.join()
+    self._thread = None
+
+  def _monitor(self):
+    while True:
+      record = self.queue.get()
+      if record is self._sentinel:
+        break
+
+      for handler in self.handlers:
+        if record.levelno >= handler.level:
+          handler.handle(record)
+
+
+def start(logger):
+  """
+  Moves output of all handlers configured on the given logger to a
+  background thread. Pending records are flushed on interpreter exit.
+
+  :param logger: Logger instance
+  :return: Started QueueListener instance
+  """
+
+  queue = Queue.Queue(-1)
+  listener = QueueListener(queue, list(logger.handlers))
+  for handler in listener.handlers:
+    logger.removeHandler(handler)
+  logger.addHandler(QueueHandler(queue))
+
+  listener.start()
+  atexit.register(listener.stop)
+  return listener
@@ -19,12 +19,14 @@
 
 from .catalog import catalog
 from . import exceptions
+from . import logsink
 
 import argparse
 import fnmatch
 import logging
 import logging.config
 import os
+import re
 import traceback
 
 logger = logging.getLogger('testbed.plotter')
@@ -43,66 +45,75 @@ class Plotter(object):
                              help='limit to specific graphs')
     args = main_parser.parse_args()
 
+    # Combine all name patterns into a single expression
+    graph_filter = None
+    if args.graphs:
+      graph_filter = re.compile('|'.join(['(?:%s)' % fnmatch.translate(x) for x in args.graphs]))
+
     # Setup logging to stderr
     logging.config.dictConfig(settings.LOGGING)
-    logger.info("Testbed root: %s" % settings.TESTBED_ROOT)
+    logsink.start(logging.getLogger('testbed'))
+    logger.info("Testbed root: %s", settings.TESTBED_ROOT)
 
     logger.info("Loading run catalog...")
     catalog.load(settings)
 
-    logger.info("Processing %d run group(s)..." % len(args.run_groups))
+    # Plotters are imported by the catalog, so this does not add any load time
+    from .graphs.base import RunOutputDescriptor
+
+    logger.info("Processing %d run group(s)...", len(args.run_groups))
     for run_id in args.run_groups:
-      logger.info("Processing run group '%s'..." % run_id)
+      logger.info("Processing run group '%s'...", run_id)
 
       # Check if the specified run group output exists
       out_dir = os.path.join(settings.OUTPUT_DIRECTORY, run_id)
       if not os.path.exists(out_dir):
-        logger.warning("Skipping run group '%s' as no output has been found!" % run_id)
+        logger.warning("Skipping run group '%s' as no output has been found!", run_id)
         continue
 
       # Find out which runs exist for this run group and process all graphs
       # with dependencies among these runs
       runs = set()
+      existing = {name for name in os.listdir(out_dir) if os.path.isdir(os.path.join(out_dir, name))}
       for run_descriptor in catalog.runs():
-        if not os.path.isdir(os.path.join(out_dir, run_descriptor.name)):
-          logger.warning("Run '%s' is missing from run group '%s'." % (run_descriptor.name, run_id))
+        if run_descriptor.name not in existing:
+          logger.warning("Run '%s' is missing from run group '%s'.", run_descriptor.name, run_id)
           continue
 
         runs.add(run_descriptor.name)
 
       for graph in catalog.graphs():
-        if args.graphs:
-          for pattern in args.graphs:
-            if fnmatch.fnmatch(graph.name, pattern):
-              break
-          else:
-            logger.info("Skipping graph '%s'." % graph.name)
-            continue
-
-        if runs.intersection(graph.runs) != set(graph.runs):
-          logger.warning("Skipping graph '%s' because of unsatisfied run dependencies." % graph.name)
+        if graph_filter is not None and not graph_filter.match(graph.name):
+          logger.info("Skipping graph '%s'.", graph.name)
+          continue
+
+        if not runs.issuperset(graph.runs):
+          logger.warning("Skipping graph '%s' because of unsatisfied run dependencies.", graph.name)
           continue
 
-        logger.info("Plotting graph '%s' from %d runs..." % (graph.name, len(graph.runs)))
-        for key, value in graph.settings.items():
-          logger.info("  [%s] = %s" % (key, value))
+        logger.info("Plotting graph '%s' from %d runs...", graph.name, len(graph.runs))
+        if logger.isEnabledFor(logging.INFO):
+          for key, value in graph.settings.items():
+            logger.info("  [%s] = %s", key, value)
         try:
           graph.plot(run_id, catalog.get_run_descriptors(graph.runs), settings)
         except KeyboardInterrupt:
           logger.info("Abort requested by user.")
           return
         except NotImplementedError:
-          logger.warning("Skipping non-implemented graph plotter '%s.%s'." %
-            (graph.plotter.__module__, graph.plotter.__name__))
+          logger.warning("Skipping non-implemented graph plotter '%s.%s'.",
+            graph.plotter.__module__, graph.plotter.__name__)
           continue
         except exceptions.MissingDatasetError:
-          logger.warning("Skipping graph '%s' due to missing dataset." % graph.name)
+          logger.warning("Skipping graph '%s' due to missing dataset.", graph.name)
           continue
         except:
           logger.error("Aborting due to error.")
           logger.error(traceback.format_exc())
           return
 
-        logger.info("Graph '%s' done." % graph.name)
+        logger.info("Graph '%s' done.", graph.name)
 
-      logger.info("Run group '%s' done." % run_id)
+      # Datasets cached for this run group are not needed by other groups
+      RunOutputDescriptor.release(run_id)
+      logger.info("Run group '%s' done.", run_id)
@@ -19,14 +19,16 @@
 
 from .catalog import catalog
 from . import exceptions
+from . import logsink
 
 import argparse
+import binascii
 import fnmatch
-import hashlib
 import importlib
 import logging
 import logging.config
 import os
+import re
 import traceback
 
 logger = logging.getLogger('testbed.runner')
@@ -43,14 +45,20 @@ class Runner(object):
                              help='limit to specific runs')
     args = main_parser.parse_args()
 
+    # Combine all name patterns into a single expression
+    run_filter = None
+    if args.runs:
+      run_filter = re.compile('|'.join(['(?:%s)' % fnmatch.translate(x) for x in args.runs]))
+
     # Setup logging to stderr
     logging.config.dictConfig(settings.LOGGING)
-    logger.info("Testbed root: %s" % settings.TESTBED_ROOT)
+    logsink.start(logging.getLogger('testbed'))
+    logger.info("Testbed root: %s", settings.TESTBED_ROOT)
 
     # Select cluster configuration
     cluster_cfg = settings.CLUSTERS[settings.CLUSTER]
 
-    logger.info("Loading cluster runner '%s'..." % settings.CLUSTER)
+    logger.info("Loading cluster runner '%s'...", settings.CLUSTER)
     i = settings.CLUSTER.rfind('.')
     module, attr = settings.CLUSTER[:i], settings.CLUSTER[i + 1:]
     try:
@@ -63,21 +71,18 @@ class Runner(object):
     catalog.load(settings, graphs=False)
 
     # Generate unique run identifier so that we can be sure that all runs have the same version
-    run_id = hashlib.md5(os.urandom(32)).hexdigest()[:5]
+    run_id = binascii.hexlify(os.urandom(3))[:5]
 
-    logger.info("Executing all runs (run_id=%s)..." % run_id)
+    logger.info("Executing all runs (run_id=%s)...", run_id)
     for descriptor in catalog.runs():
-      if args.runs:
-        for pattern in args.runs:
-          if fnmatch.fnmatch(descriptor.name, pattern):
-            break
-        else:
-          logger.info("Skipping run '%s'." % descriptor.name)
-          continue
-
-      logger.info("Starting run '%s'" % descriptor.name)
-      for key, value in descriptor.settings.items():
-        logger.info("  [%s] = %s" % (key, value))
+      if run_filter is not None and not run_filter.match(descriptor.name):
+        logger.info("Skipping run '%s'.", descriptor.name)
+        continue
+
+      logger.info("Starting run '%s'", descriptor.name)
+      if logger.isEnabledFor(logging.INFO):
+        for key, value in descriptor.settings.items():
+          logger.info("  [%s] = %s", key, value)
 
       try:
         descriptor.run(cluster, run_id)
@@ -92,4 +97,4 @@ class Runner(object):
         logger.error(traceback.format_exc())
         return
 
-      logger.info("Run '%s' completed." % descriptor.name)
+      logger.info("Run '%s' completed.", descriptor.name)
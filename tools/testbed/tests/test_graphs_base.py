@@ -0,0 +1,60 @@
+#
+# This file is part of UNISPHERE.
+#
+# Copyright (C) 2013 Jernej Kos <jernej@kos.mx>
+#
+# This library is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+from ..graphs import _fast, base
+
+import unittest
+
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.cbook
+import matplotlib.figure
+import numpy
+
+
+class CompactECDFTestCase(unittest.TestCase):
+  def test_steps_post_matches_ecdf(self):
+    """
+    Step vertices drawn from a compacted ECDF must follow the uncompacted
+    ECDF of the same values.
+    """
+
+    data = numpy.array([3, 1, 4, 1, 5, 9, 2, 6, 5, 3, 5, 8, 9, 7, 9], dtype=numpy.float64)
+    x, y = base.compact_ecdf(*_fast.ecdf(data), xmin=0.0)
+
+    ax = matplotlib.figure.Figure().add_subplot(111)
+    line, = ax.plot(x, y, drawstyle='steps-post')
+    steps = matplotlib.cbook.STEP_LOOKUP_MAP[line.get_drawstyle()](*line.get_data())
+
+    # Every horizontal segment must lie at the ECDF level of its left end
+    for i in xrange(steps.shape[1] - 1):
+      x0, x1 = steps[0][i], steps[0][i + 1]
+      level = steps[1][i]
+      if x0 == x1 or level != steps[1][i + 1]:
+        continue
+
+      for q in (x0, (x0 + x1) / 2.0):
+        self.assertAlmostEqual(level, numpy.mean(data <= q))
+
+    # The final level is reached exactly at the largest value
+    self.assertEqual(steps[0][numpy.argmax(steps[1])], data.max())
+
+
+if __name__ == '__main__':
+  unittest.main()
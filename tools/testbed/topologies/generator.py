@@ -20,7 +20,6 @@
 from .. import exceptions
 
 import random
-import networkx as nx
 
 
 class Arguments(object):
@@ -42,6 +41,9 @@ def generate(topology, arguments, filename):
   Generates a topology.
   """
 
+  # NetworkX is only needed when a topology is actually generated
+  import networkx as nx
+
   # Prepare the arguments that can be filled in
   args = Arguments()
   for arg in topology.args:
@@ -56,6 +58,7 @@ def generate(topology, arguments, filename):
 
   # Generate communities
   community_graphs = {}
+  community_nodes = {}
   for community, params in communities.items():
     community_size = evaluate_argument(params['n'], args)
     if community_size == 0:
@@ -77,36 +80,67 @@ def generate(topology, arguments, filename):
       raise exceptions.ImproperlyConfigured('Community topology generator "type" not specified!')
 
     sybil = (community == "sybil")
-    relabel = { node: "%s%s" % (community, node) for node in graph.nodes() }
+    relabel = dict.fromkeys(graph.nodes())
+    for node in relabel:
+      relabel[node] = community + str(node)
     nx.relabel_nodes(graph, relabel, copy=False)
     trust_topology.add_nodes_from(graph, community=community, sybil=sybil)
     trust_topology.add_edges_from(graph.edges())
     community_graphs[community] = graph
+    community_nodes[community] = tuple(graph.nodes())
 
   # Interconnect communities
+  rr = random.randrange
   for connection in evaluate_argument(topology.connections, args):
-    src = community_graphs.get(connection['src'], None)
-    dst = community_graphs.get(connection['dst'], None)
-    if src is None or dst is None:
+    src_nodes = community_nodes.get(connection['src'], None)
+    dst_nodes = community_nodes.get(connection['dst'], None)
+    if src_nodes is None or dst_nodes is None:
       continue
 
-    for i in xrange(evaluate_argument(connection['count'], args)):
-      while True:
-        # select random node in src
-        snode = random.choice(src.nodes())
-        # select random node in dst
-        dnode = random.choice(dst.nodes())
-        if not trust_topology.has_edge(snode, dnode):
-          break
-
-      # create an edge between them in trust topology
-      trust_topology.add_edge(snode, dnode)
+    # Node lists are snapshotted once per community, so sampling does not
+    # need to materialize them again on every iteration
+    n_src = len(src_nodes)
+    n_dst = len(dst_nodes)
+    n_pairs = n_src * n_dst
+    count = evaluate_argument(connection['count'], args)
+    if count > n_pairs // 2:
+      # Dense interconnection, draw distinct pair indices up front as rejection
+      # sampling would mostly be hitting already drawn pairs
+      candidates = iter(random.sample(xrange(n_pairs), min(count, n_pairs)))
+    else:
+      candidates = iter(())
+
+    # Pairs that are already linked are skipped, remaining ones are drawn at random;
+    # edges are added as soon as they are accepted, so that a pair drawn in both
+    # directions within the same community is only counted once
+    drawn = set()
+    placed = 0
+    while placed < count:
+      if len(drawn) == n_pairs:
+        raise exceptions.ImproperlyConfigured("Unable to place %d edges between communities '%s' and '%s'!" %
+          (count, connection['src'], connection['dst']))
+
+      index = next(candidates, None)
+      if index is None:
+        index = rr(n_pairs)
+      if index in drawn:
+        continue
+      drawn.add(index)
+
+      # select random node in src and random node in dst
+      i, j = divmod(index, n_dst)
+      snode = src_nodes[i]
+      dnode = dst_nodes[j]
+      if not trust_topology.has_edge(snode, dnode):
+        # create an edge between them in trust topology
+        trust_topology.add_edge(snode, dnode)
+        placed += 1
 
   # Assign identifiers to nodes, setup their status
   for node, data in trust_topology.nodes(data=True):
     data['sybil'] = int(data.get('sybil', False))
     data['label'] = str(node)
 
-    trust_topology.add_node(node, data)
-
-  nx.write_graphml(trust_topology, filename)
+  # Write the topology through a large buffer to reduce write calls
+  with open(filename, 'wb', 1 << 20) as f:
+    nx.write_graphml(trust_topology, f)
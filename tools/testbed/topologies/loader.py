@@ -1,5 +1,3 @@
-import networkx as nx
-
 from .. import exceptions
 
 
@@ -8,6 +6,9 @@ def load(topology, arguments, filename):
   Loads a topology from a file.
   """
 
+  # NetworkX is only needed when a topology is actually loaded
+  import networkx as nx
+
   # Determine file format
   fmt = topology.settings['format']
   in_filename = topology.settings['filename']
@@ -24,5 +25,6 @@ def load(topology, arguments, filename):
     if 'label' not in graph.node[node]:
       graph.node[node]['label'] = str(node)
 
-  # Convert to GraphML and write to output file
-  nx.write_graphml(graph, filename)
+  # Convert to GraphML and write to output file through a large buffer
+  with open(filename, 'wb', 1 << 20) as f:
+    nx.write_graphml(graph, f)